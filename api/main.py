@@ -5,17 +5,22 @@ Handles form submissions and stores them in Supabase/PostgreSQL.
 """
 
 import os
-import json
 import logging
 from uuid import uuid4
 from datetime import datetime
-from typing import Optional, List, Any
+from typing import Optional, List, Dict, Any, AsyncIterator
 
-from fastapi import FastAPI, HTTPException
+import orjson
+from cachetools import TTLCache
+from fastapi import Depends, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, EmailStr, Field
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator, model_validator
+from sqlalchemy import Integer, Text, bindparam, text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,7 +29,8 @@ logger = logging.getLogger(__name__)
 app = FastAPI(
     title="HireCharm Onboarding API",
     description="API for capturing client onboarding form submissions",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
 )
 
 # CORS middleware
@@ -56,11 +62,296 @@ def get_database_url() -> str:
     return f"postgresql://{user}:{password}@{host}:{port}/{database}"
 
 
-def get_db_session():
-    """Create a database session."""
-    engine = create_engine(get_database_url())
-    Session = sessionmaker(bind=engine)
-    return Session()
+def get_async_database_url() -> URL:
+    """Point the configured database URL at the asyncpg driver."""
+    url = make_url(get_database_url()).set(drivername="postgresql+asyncpg")
+
+    # asyncpg takes `ssl` instead of libpq's `sslmode` (e.g. Supabase URLs)
+    if "sslmode" in url.query:
+        url = url.update_query_dict({"ssl": url.query["sslmode"]})
+        url = url.difference_update_query(["sslmode"])
+
+    return url
+
+
+# Parsed once at import; the engine is built from it exactly once
+DATABASE_URL = get_async_database_url()
+
+# Prepared statements cached per connection; set to 0 behind a
+# transaction-mode pooler (pgbouncer, Supabase on port 6543)
+STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '500'))
+
+DB_CONNECT_ARGS = {
+    "prepared_statement_cache_size": STATEMENT_CACHE_SIZE,
+    "statement_cache_size": STATEMENT_CACHE_SIZE,
+}
+if STATEMENT_CACHE_SIZE == 0:
+    # asyncpg still prepares every statement, under sequential names that
+    # collide once a pooler hands the backend to another client; unique
+    # names avoid "prepared statement ... already exists"
+    DB_CONNECT_ARGS["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+
+# Every uvicorn worker builds its own pool, so DB_MAX_CONNECTIONS is split
+# across WEB_CONCURRENCY workers. The container never opens more than
+# max(DB_MAX_CONNECTIONS, WEB_CONCURRENCY) connections.
+WEB_CONCURRENCY = int(os.getenv('WEB_CONCURRENCY', '2'))
+DB_MAX_CONNECTIONS = int(os.getenv('DB_MAX_CONNECTIONS', '20'))
+POOL_SIZE = max(1, DB_MAX_CONNECTIONS // WEB_CONCURRENCY)
+
+# Engine and pool are created once per process and shared by all requests
+engine = create_async_engine(
+    DATABASE_URL,
+    pool_size=POOL_SIZE,
+    max_overflow=0,
+    pool_pre_ping=True,
+    pool_recycle=1800,
+    # JSON/JSONB binds and results go through orjson instead of stdlib json
+    json_serializer=lambda value: orjson.dumps(value).decode(),
+    json_deserializer=orjson.loads,
+    connect_args=DB_CONNECT_ARGS,
+)
+SessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+# company_name -> client id, so repeat submitters skip the clients lookup.
+# Only filled after a successful commit, so it never holds a rolled-back id.
+client_id_cache: TTLCache = TTLCache(maxsize=10_000, ttl=300)
+
+
+async def get_db() -> AsyncIterator[AsyncSession]:
+    """Yield a database session for the duration of a request."""
+    async with SessionLocal() as session:
+        yield session
+
+
+async def upsert_client(session: AsyncSession, company_name: str) -> str:
+    """Find or create the client named `company_name` and return its id."""
+    result = await session.execute(UPSERT_CLIENT, {"name": company_name})
+    row = result.one()
+    client_id = str(row.id)
+    if row.inserted:
+        logger.info(f"Created new client: {company_name} ({client_id})")
+    return client_id
+
+
+async def copy_rows(
+    session: AsyncSession,
+    table: str,
+    columns: Dict[str, str],
+    submission_id: Any,
+    params: Dict[str, list],
+) -> None:
+    """Stream a submission's child rows into `table` with COPY.
+
+    `params` holds the unnest() arrays built for INSERT_SUBMISSION, and
+    `columns` maps each of its keys to the table column it fills. Rows are
+    COPYed into a temp staging table with the same column types, then moved
+    with INSERT ... SELECT so id and created_at come from gen_random_uuid()
+    and NOW() as on the unnest() path, whatever the column types/defaults.
+    """
+    column_list = ", ".join(columns.values())
+    staging_table = f"{table}_copy"
+
+    await session.execute(text(
+        f"CREATE TEMP TABLE {staging_table} ON COMMIT DROP AS "
+        f"SELECT {column_list} FROM {table} WITH NO DATA"
+    ))
+
+    conn = await session.connection()
+    raw_conn = await conn.get_raw_connection()
+    await raw_conn.driver_connection.copy_records_to_table(
+        staging_table,
+        columns=list(columns.values()),
+        records=list(zip(*(params[key] for key in columns))),
+    )
+
+    await session.execute(
+        text(
+            f"INSERT INTO {table} (id, submission_id, {column_list}, created_at) "
+            f"SELECT gen_random_uuid(), :submission_id, {column_list}, NOW() "
+            f"FROM {staging_table}"
+        ),
+        {"submission_id": submission_id},
+    )
+
+
+# =============================================================================
+# SQL Statements
+# =============================================================================
+
+# Statements are built once at import; asyncpg prepares each one once per
+# pooled connection and reuses the server-side plan from its statement cache.
+
+# Find-or-create in one round-trip; needs UNIQUE (name) on clients.
+# xmax = 0 only for a freshly inserted row.
+UPSERT_CLIENT = text("""
+    INSERT INTO clients (id, name, created_at)
+    VALUES (gen_random_uuid(), :name, NOW())
+    ON CONFLICT (name) DO UPDATE SET name = EXCLUDED.name
+    RETURNING id, (xmax = 0) AS inserted
+""")
+
+# SQLSTATE raised when a submission references a client that no longer exists
+FOREIGN_KEY_VIOLATION = "23503"
+
+INSERT_SUBMISSION = text("""
+    WITH ins_sub AS (
+        INSERT INTO client_onboarding_submissions (
+            id, client_id, submission_version,
+            company_name, website, contact_name, contact_email,
+            employee_count, funding_stage, hq_location,
+            core_product, target_customer, annual_revenue, acv,
+            sales_cycle_length, self_serve_pct,
+            signals, signal_details, job_titles,
+            outbound_tools, outbound_tools_other, crm, lead_sources,
+            customer_voice, roi_results, case_studies_description,
+            case_studies, tone_style, messaging_notes,
+            primary_gtm_objective, primary_gtm_objective_other,
+            success_metrics, success_definition, timeline_urgency, monthly_budget,
+            submission_status, submitted_at, created_at
+        ) VALUES (
+            gen_random_uuid(), :client_id, 1,
+            :company_name, :website, :contact_name, :contact_email,
+            :employee_count, :funding_stage, :hq_location,
+            :core_product, :target_customer, :annual_revenue, :acv,
+            :sales_cycle_length, :self_serve_pct,
+            :signals, :signal_details, :job_titles,
+            :outbound_tools, :outbound_tools_other, :crm, :lead_sources,
+            :customer_voice, :roi_results, :case_studies_description,
+            :case_studies, :tone_style, :messaging_notes,
+            :primary_gtm_objective, :primary_gtm_objective_other,
+            :success_metrics, :success_definition, :timeline_urgency, :monthly_budget,
+            'submitted', NOW(), NOW()
+        )
+        RETURNING id
+    ), ins_segs AS (
+        INSERT INTO client_segments (
+            id, submission_id, segment_order,
+            segment_name, revenue_percentage, unique_characteristics,
+            pain_points, buying_triggers, created_at
+        )
+        SELECT
+            gen_random_uuid(), ins_sub.id, t.segment_order,
+            t.segment_name, t.revenue_percentage, t.unique_characteristics,
+            t.pain_points, t.buying_triggers, NOW()
+        FROM ins_sub, unnest(
+            :seg_orders,
+            :seg_names, :seg_revenues, :seg_characteristics,
+            :seg_pain_points, :seg_triggers
+        ) AS t(
+            segment_order,
+            segment_name, revenue_percentage, unique_characteristics,
+            pain_points, buying_triggers
+        )
+    ), ins_personas AS (
+        INSERT INTO client_personas (
+            id, submission_id, persona_order,
+            job_title, primary_segment, seniority_level,
+            pain_before_buying, aha_moment, objections,
+            decision_criteria, created_at
+        )
+        SELECT
+            gen_random_uuid(), ins_sub.id, p.persona_order,
+            p.job_title, p.primary_segment, p.seniority_level,
+            p.pain_before_buying, p.aha_moment, p.objections,
+            p.decision_criteria, NOW()
+        FROM ins_sub, unnest(
+            :persona_orders,
+            :persona_titles, :persona_segments, :persona_seniorities,
+            :persona_pains, :persona_aha_moments,
+            :persona_objections, :persona_criteria
+        ) AS p(
+            persona_order,
+            job_title, primary_segment, seniority_level,
+            pain_before_buying, aha_moment, objections,
+            decision_criteria
+        )
+    ), async_commit AS (
+        -- SET LOCAL synchronous_commit = off, folded into this statement so
+        -- it costs no extra round-trip. COMMIT then skips waiting for the WAL
+        -- fsync: a server crash can lose the last few hundred ms of
+        -- submissions (never corrupt them), acceptable for form data.
+        SELECT set_config('synchronous_commit', 'off', true)
+    )
+    SELECT ins_sub.id FROM ins_sub, async_commit
+""").bindparams(
+    # Array and JSONB binds are typed once here; SQLAlchemy renders the
+    # $n::TYPE casts unnest() needs and asyncpg learns the types at prepare
+    *[
+        bindparam(name, type_=ARRAY(Text))
+        for name in (
+            "signals", "job_titles", "outbound_tools", "lead_sources", "success_metrics",
+            "seg_names", "seg_characteristics", "seg_pain_points", "seg_triggers",
+            "persona_titles", "persona_segments", "persona_seniorities", "persona_pains",
+            "persona_aha_moments", "persona_objections", "persona_criteria",
+        )
+    ],
+    *[
+        bindparam(name, type_=ARRAY(Integer))
+        for name in ("seg_orders", "seg_revenues", "persona_orders")
+    ],
+    # Dicts/lists are serialized by the engine; None stays SQL NULL
+    bindparam("signal_details", type_=JSONB(none_as_null=True)),
+    bindparam("case_studies", type_=JSONB(none_as_null=True)),
+)
+
+# Above this many rows, segments/personas skip the unnest() arrays and are
+# streamed with COPY (via a staging table) once the submission row exists
+COPY_THRESHOLD = 50
+
+# unnest() array param -> table column, for the COPY path
+SEGMENT_COPY_COLUMNS = {
+    "seg_orders": "segment_order",
+    "seg_names": "segment_name",
+    "seg_revenues": "revenue_percentage",
+    "seg_characteristics": "unique_characteristics",
+    "seg_pain_points": "pain_points",
+    "seg_triggers": "buying_triggers",
+}
+
+PERSONA_COPY_COLUMNS = {
+    "persona_orders": "persona_order",
+    "persona_titles": "job_title",
+    "persona_segments": "primary_segment",
+    "persona_seniorities": "seniority_level",
+    "persona_pains": "pain_before_buying",
+    "persona_aha_moments": "aha_moment",
+    "persona_objections": "objections",
+    "persona_criteria": "decision_criteria",
+}
+
+# unnest() arrays for submissions without segments/personas (or whose rows
+# go through COPY); shared and never mutated
+EMPTY_SEGMENT_PARAMS = {
+    "seg_orders": [], "seg_names": [], "seg_revenues": [],
+    "seg_characteristics": [], "seg_pain_points": [], "seg_triggers": [],
+}
+
+EMPTY_PERSONA_PARAMS = {
+    "persona_orders": [], "persona_titles": [], "persona_segments": [],
+    "persona_seniorities": [], "persona_pains": [], "persona_aha_moments": [],
+    "persona_objections": [], "persona_criteria": [],
+}
+
+# Submission with its segments and personas, assembled as JSON text by
+# Postgres so the response body needs no Python-side encoding
+SELECT_SUBMISSION = text("""
+    SELECT CAST(
+        to_jsonb(s) || jsonb_build_object(
+            'segments', COALESCE((
+                SELECT jsonb_agg(seg ORDER BY seg.segment_order)
+                FROM client_segments seg
+                WHERE seg.submission_id = s.id
+            ), CAST('[]' AS JSONB)),
+            'personas', COALESCE((
+                SELECT jsonb_agg(p ORDER BY p.persona_order)
+                FROM client_personas p
+                WHERE p.submission_id = s.id
+            ), CAST('[]' AS JSONB))
+        ) AS TEXT
+    )
+    FROM client_onboarding_submissions s
+    WHERE s.id = :id
+""")
 
 
 # =============================================================================
@@ -68,18 +359,43 @@ def get_db_session():
 # =============================================================================
 
 class Segment(BaseModel):
-    name: str = Field(default="", alias="segment_name")
+    model_config = ConfigDict(populate_by_name=True)
+
+    name: Optional[str] = Field(default="", alias="segment_name")
     revenue_pct: Optional[int] = Field(default=None, alias="revenue_percentage")
     unique_characteristics: Optional[str] = None
     pain_points: Optional[str] = None
     buying_triggers: Optional[str] = None
 
-    class Config:
-        populate_by_name = True
+    @model_validator(mode="before")
+    @classmethod
+    def prefer_short_keys(cls, data: Any) -> Any:
+        # Keep the form's precedence: name over segment_name,
+        # revenue_pct over revenue_percentage
+        if isinstance(data, dict):
+            data = dict(data)
+            name = data.pop("name", None)
+            revenue_pct = data.pop("revenue_pct", None)
+            data["segment_name"] = name or data.get("segment_name")
+            data["revenue_percentage"] = revenue_pct or data.get("revenue_percentage")
+        return data
+
+    @field_validator("revenue_pct", mode="before")
+    @classmethod
+    def coerce_revenue_pct(cls, value: Any) -> Optional[int]:
+        # The form sends "" for a blank field and may send decimals
+        if value is None or isinstance(value, bool):
+            return None
+        try:
+            return round(float(value))
+        except (TypeError, ValueError, OverflowError):
+            return None
 
 
 class Persona(BaseModel):
-    job_title: str = ""
+    model_config = ConfigDict(populate_by_name=True)
+
+    job_title: Optional[str] = ""
     primary_segment: Optional[str] = None
     seniority_level: Optional[str] = None
     pain_before_buying: Optional[str] = None
@@ -87,13 +403,13 @@ class Persona(BaseModel):
     objections: Optional[str] = None
     decision_criteria: Optional[str] = None
 
-    class Config:
-        populate_by_name = True
-
 
 class OnboardingSubmission(BaseModel):
     """Full onboarding form submission payload."""
 
+    # Form fields that are not persisted are dropped during validation
+    model_config = ConfigDict(extra="ignore", populate_by_name=True)
+
     # Client identifier (required for linking)
     client_id: Optional[str] = None
 
@@ -117,11 +433,10 @@ class OnboardingSubmission(BaseModel):
     # Section 3: Market Signals
     signals: Optional[List[str]] = []
     signal_details: Optional[dict] = None
-    custom_signals: Optional[List[str]] = []
 
     # Section 4: Audience
-    segments: Optional[List[dict]] = []
-    personas: Optional[List[dict]] = []
+    segments: Optional[List[Segment]] = []
+    personas: Optional[List[Persona]] = []
     job_titles: Optional[List[str]] = []
 
     # Section 5: Process
@@ -129,7 +444,6 @@ class OnboardingSubmission(BaseModel):
     outbound_tools_other: Optional[str] = None
     crm: Optional[str] = None
     lead_sources: Optional[List[str]] = []
-    other_channels: Optional[List[str]] = []
 
     # Section 6: Messaging
     customer_voice: Optional[str] = None
@@ -138,8 +452,6 @@ class OnboardingSubmission(BaseModel):
     case_studies: Optional[List[dict]] = []
     tone_style: Optional[str] = None
     messaging_notes: Optional[str] = None
-    key_differentiators: Optional[List[str]] = []
-    competitors: Optional[List[str]] = []
 
     # Section 7: Goals
     primary_gtm_objective: Optional[str] = None
@@ -149,9 +461,6 @@ class OnboardingSubmission(BaseModel):
     timeline_urgency: Optional[str] = None
     monthly_budget: Optional[str] = None
 
-    class Config:
-        extra = "allow"  # Allow extra fields from form
-
 
 class SubmissionResponse(BaseModel):
     success: bool
@@ -169,8 +478,15 @@ async def health_check():
     return {"status": "healthy", "timestamp": datetime.utcnow().isoformat()}
 
 
-@app.post("/onboarding/submit", response_model=SubmissionResponse)
-async def submit_onboarding(submission: OnboardingSubmission):
+@app.post(
+    "/onboarding/submit",
+    response_model=None,
+    responses={200: {"model": SubmissionResponse}},
+)
+async def submit_onboarding(
+    submission: OnboardingSubmission,
+    session: AsyncSession = Depends(get_db),
+):
     """
     Handle onboarding form submission.
 
@@ -179,35 +495,17 @@ async def submit_onboarding(submission: OnboardingSubmission):
     - client_segments (segment array)
     - client_personas (persona array)
     """
-    session = None
-
     try:
-        session = get_db_session()
-        submission_id = str(uuid4())
-
         # Resolve client_id
         client_id = submission.client_id
 
         # If no client_id provided, try to find/create by company_name
+        cached_client_id = None
         if not client_id and submission.company_name:
-            result = session.execute(
-                text("SELECT id FROM clients WHERE name = :name LIMIT 1"),
-                {"name": submission.company_name}
-            )
-            row = result.fetchone()
-            if row:
-                client_id = str(row[0])
-            else:
-                # Create new client
-                client_id = str(uuid4())
-                session.execute(
-                    text("""
-                        INSERT INTO clients (id, name, created_at)
-                        VALUES (:id, :name, NOW())
-                    """),
-                    {"id": client_id, "name": submission.company_name}
-                )
-                logger.info(f"Created new client: {submission.company_name} ({client_id})")
+            client_id = cached_client_id = client_id_cache.get(submission.company_name)
+
+        if not client_id and submission.company_name:
+            client_id = await upsert_client(session, submission.company_name)
 
         if not client_id:
             raise HTTPException(
@@ -216,227 +514,162 @@ async def submit_onboarding(submission: OnboardingSubmission):
             )
 
         # Normalize self_serve_pct
+        # (asyncpg's text codec only accepts str, so stringify any value)
         self_serve_pct = None
         if submission.self_serve_pct is not None:
-            if isinstance(submission.self_serve_pct, int):
-                self_serve_pct = str(submission.self_serve_pct)
-            else:
-                self_serve_pct = submission.self_serve_pct
-
-        # Insert main submission
-        session.execute(
-            text("""
-                INSERT INTO client_onboarding_submissions (
-                    id, client_id, submission_version,
-                    company_name, website, contact_name, contact_email,
-                    employee_count, funding_stage, hq_location,
-                    core_product, target_customer, annual_revenue, acv,
-                    sales_cycle_length, self_serve_pct,
-                    signals, signal_details, job_titles,
-                    outbound_tools, outbound_tools_other, crm, lead_sources,
-                    customer_voice, roi_results, case_studies_description,
-                    case_studies, tone_style, messaging_notes,
-                    primary_gtm_objective, primary_gtm_objective_other,
-                    success_metrics, success_definition, timeline_urgency, monthly_budget,
-                    submission_status, submitted_at, created_at
-                ) VALUES (
-                    :id, :client_id, 1,
-                    :company_name, :website, :contact_name, :contact_email,
-                    :employee_count, :funding_stage, :hq_location,
-                    :core_product, :target_customer, :annual_revenue, :acv,
-                    :sales_cycle_length, :self_serve_pct,
-                    :signals, :signal_details, :job_titles,
-                    :outbound_tools, :outbound_tools_other, :crm, :lead_sources,
-                    :customer_voice, :roi_results, :case_studies_description,
-                    :case_studies, :tone_style, :messaging_notes,
-                    :primary_gtm_objective, :primary_gtm_objective_other,
-                    :success_metrics, :success_definition, :timeline_urgency, :monthly_budget,
-                    'submitted', NOW(), NOW()
-                )
-            """),
-            {
-                "id": submission_id,
-                "client_id": client_id,
-                "company_name": submission.company_name,
-                "website": submission.website,
-                "contact_name": submission.contact_name,
-                "contact_email": submission.contact_email,
-                "employee_count": submission.employee_count,
-                "funding_stage": submission.funding_stage,
-                "hq_location": submission.hq_location,
-                "core_product": submission.core_product,
-                "target_customer": submission.target_customer,
-                "annual_revenue": submission.annual_revenue,
-                "acv": submission.acv,
-                "sales_cycle_length": submission.sales_cycle_length,
-                "self_serve_pct": self_serve_pct,
-                "signals": submission.signals or [],
-                "signal_details": json.dumps(submission.signal_details) if submission.signal_details else None,
-                "job_titles": submission.job_titles or [],
-                "outbound_tools": submission.outbound_tools or [],
-                "outbound_tools_other": submission.outbound_tools_other,
-                "crm": submission.crm,
-                "lead_sources": submission.lead_sources or [],
-                "customer_voice": submission.customer_voice,
-                "roi_results": submission.roi_results,
-                "case_studies_description": submission.case_studies_description,
-                "case_studies": json.dumps(submission.case_studies) if submission.case_studies else None,
-                "tone_style": submission.tone_style,
-                "messaging_notes": submission.messaging_notes,
-                "primary_gtm_objective": submission.primary_gtm_objective,
-                "primary_gtm_objective_other": submission.primary_gtm_objective_other,
-                "success_metrics": submission.success_metrics or [],
-                "success_definition": submission.success_definition,
-                "timeline_urgency": submission.timeline_urgency,
-                "monthly_budget": submission.monthly_budget,
+            self_serve_pct = str(submission.self_serve_pct)
+
+        # Flatten segments/personas into parallel arrays for unnest(),
+        # skipping the work entirely for the common empty case
+        segment_rows = [
+            (idx, seg) for idx, seg in enumerate(submission.segments or [])
+            if seg.name
+        ]
+        segment_params = EMPTY_SEGMENT_PARAMS
+        if segment_rows:
+            segment_params = {
+                "seg_orders": [idx for idx, _ in segment_rows],
+                "seg_names": [seg.name for _, seg in segment_rows],
+                "seg_revenues": [seg.revenue_pct or None for _, seg in segment_rows],
+                "seg_characteristics": [seg.unique_characteristics for _, seg in segment_rows],
+                "seg_pain_points": [seg.pain_points for _, seg in segment_rows],
+                "seg_triggers": [seg.buying_triggers for _, seg in segment_rows],
             }
-        )
 
-        # Insert segments
-        segments = submission.segments or []
-        for idx, seg in enumerate(segments):
-            if not seg.get('name') and not seg.get('segment_name'):
-                continue
-
-            session.execute(
-                text("""
-                    INSERT INTO client_segments (
-                        id, submission_id, segment_order,
-                        segment_name, revenue_percentage, unique_characteristics,
-                        pain_points, buying_triggers, created_at
-                    ) VALUES (
-                        :id, :submission_id, :segment_order,
-                        :segment_name, :revenue_percentage, :unique_characteristics,
-                        :pain_points, :buying_triggers, NOW()
-                    )
-                """),
-                {
-                    "id": str(uuid4()),
-                    "submission_id": submission_id,
-                    "segment_order": idx,
-                    "segment_name": seg.get('name') or seg.get('segment_name', ''),
-                    "revenue_percentage": seg.get('revenue_pct') or seg.get('revenue_percentage'),
-                    "unique_characteristics": seg.get('unique_characteristics'),
-                    "pain_points": seg.get('pain_points'),
-                    "buying_triggers": seg.get('buying_triggers'),
-                }
-            )
+        persona_rows = [
+            (idx, persona) for idx, persona in enumerate(submission.personas or [])
+            if persona.job_title
+        ]
+        persona_params = EMPTY_PERSONA_PARAMS
+        if persona_rows:
+            persona_params = {
+                "persona_orders": [idx for idx, _ in persona_rows],
+                "persona_titles": [persona.job_title for _, persona in persona_rows],
+                "persona_segments": [persona.primary_segment for _, persona in persona_rows],
+                "persona_seniorities": [persona.seniority_level for _, persona in persona_rows],
+                "persona_pains": [persona.pain_before_buying for _, persona in persona_rows],
+                "persona_aha_moments": [persona.aha_moment for _, persona in persona_rows],
+                "persona_objections": [persona.objections for _, persona in persona_rows],
+                "persona_criteria": [persona.decision_criteria for _, persona in persona_rows],
+            }
 
-        # Insert personas
-        personas = submission.personas or []
-        for idx, persona in enumerate(personas):
-            if not persona.get('job_title'):
-                continue
-
-            session.execute(
-                text("""
-                    INSERT INTO client_personas (
-                        id, submission_id, persona_order,
-                        job_title, primary_segment, seniority_level,
-                        pain_before_buying, aha_moment, objections,
-                        decision_criteria, created_at
-                    ) VALUES (
-                        :id, :submission_id, :persona_order,
-                        :job_title, :primary_segment, :seniority_level,
-                        :pain_before_buying, :aha_moment, :objections,
-                        :decision_criteria, NOW()
-                    )
-                """),
-                {
-                    "id": str(uuid4()),
-                    "submission_id": submission_id,
-                    "persona_order": idx,
-                    "job_title": persona.get('job_title', ''),
-                    "primary_segment": persona.get('primary_segment'),
-                    "seniority_level": persona.get('seniority_level'),
-                    "pain_before_buying": persona.get('pain_before_buying'),
-                    "aha_moment": persona.get('aha_moment'),
-                    "objections": persona.get('objections'),
-                    "decision_criteria": persona.get('decision_criteria'),
-                }
+        # Large lists go through COPY instead of the unnest() arrays
+        copy_segments = len(segment_rows) > COPY_THRESHOLD
+        copy_personas = len(persona_rows) > COPY_THRESHOLD
+
+        submission_values = {
+            "company_name": submission.company_name,
+            "website": submission.website,
+            "contact_name": submission.contact_name,
+            "contact_email": submission.contact_email,
+            "employee_count": submission.employee_count,
+            "funding_stage": submission.funding_stage,
+            "hq_location": submission.hq_location,
+            "core_product": submission.core_product,
+            "target_customer": submission.target_customer,
+            "annual_revenue": submission.annual_revenue,
+            "acv": submission.acv,
+            "sales_cycle_length": submission.sales_cycle_length,
+            "self_serve_pct": self_serve_pct,
+            "signals": submission.signals or [],
+            "signal_details": submission.signal_details or None,
+            "job_titles": submission.job_titles or [],
+            "outbound_tools": submission.outbound_tools or [],
+            "outbound_tools_other": submission.outbound_tools_other,
+            "crm": submission.crm,
+            "lead_sources": submission.lead_sources or [],
+            "customer_voice": submission.customer_voice,
+            "roi_results": submission.roi_results,
+            "case_studies_description": submission.case_studies_description,
+            "case_studies": submission.case_studies or None,
+            "tone_style": submission.tone_style,
+            "messaging_notes": submission.messaging_notes,
+            "primary_gtm_objective": submission.primary_gtm_objective,
+            "primary_gtm_objective_other": submission.primary_gtm_objective_other,
+            "success_metrics": submission.success_metrics or [],
+            "success_definition": submission.success_definition,
+            "timeline_urgency": submission.timeline_urgency,
+            "monthly_budget": submission.monthly_budget,
+            **(EMPTY_SEGMENT_PARAMS if copy_segments else segment_params),
+            **(EMPTY_PERSONA_PARAMS if copy_personas else persona_params),
+        }
+
+        async def insert_submission(client_id: str) -> Any:
+            # Insert main submission, segments and personas in a single statement
+            result = await session.execute(
+                INSERT_SUBMISSION,
+                {"client_id": client_id, **submission_values}
             )
+            submission_id = result.scalar_one()
+
+            if copy_segments:
+                await copy_rows(session, "client_segments", SEGMENT_COPY_COLUMNS, submission_id, segment_params)
+            if copy_personas:
+                await copy_rows(session, "client_personas", PERSONA_COPY_COLUMNS, submission_id, persona_params)
 
-        session.commit()
+            return submission_id
+
+        try:
+            submission_id = await insert_submission(client_id)
+        except IntegrityError as e:
+            if not cached_client_id or getattr(e.orig, "sqlstate", None) != FOREIGN_KEY_VIOLATION:
+                raise
+            # The cached client was deleted since it was cached: evict it,
+            # re-resolve through the upsert and retry once
+            logger.warning(f"Cached client {cached_client_id} for {submission.company_name} is gone, retrying")
+            await session.rollback()
+            client_id_cache.pop(submission.company_name, None)
+            client_id = await upsert_client(session, submission.company_name)
+            submission_id = await insert_submission(client_id)
+
+        await session.commit()
+
+        if not submission.client_id and submission.company_name:
+            client_id_cache[submission.company_name] = client_id
 
         logger.info(f"Onboarding submission saved: {submission_id} for client {client_id}")
 
-        return SubmissionResponse(
+        # Fields are known-good, so skip pydantic validation, and hand the
+        # field dict straight to orjson to skip FastAPI's jsonable_encoder
+        response = SubmissionResponse.model_construct(
             success=True,
-            submission_id=submission_id,
+            submission_id=str(submission_id),
             message="Onboarding form submitted successfully"
         )
+        return ORJSONResponse(response.__dict__)
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error saving submission: {e}")
-        if session:
-            session.rollback()
+        await session.rollback()
+        # Drop a possibly stale cached client id (e.g. the client was deleted)
+        if submission.company_name:
+            client_id_cache.pop(submission.company_name, None)
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if session:
-            session.close()
 
 
 @app.get("/onboarding/{submission_id}")
-async def get_submission(submission_id: str):
+async def get_submission(submission_id: str, session: AsyncSession = Depends(get_db)):
     """Retrieve a submission by ID."""
-    session = None
-
     try:
-        session = get_db_session()
-
-        # Get main submission
-        result = session.execute(
-            text("""
-                SELECT * FROM client_onboarding_submissions
-                WHERE id = :id
-            """),
+        result = await session.execute(
+            SELECT_SUBMISSION,
             {"id": submission_id}
         )
-        row = result.fetchone()
+        submission_json = result.scalar_one_or_none()
 
-        if not row:
+        if submission_json is None:
             raise HTTPException(status_code=404, detail="Submission not found")
 
-        # Convert to dict
-        columns = result.keys()
-        submission = dict(zip(columns, row))
-
-        # Get segments
-        seg_result = session.execute(
-            text("""
-                SELECT * FROM client_segments
-                WHERE submission_id = :id
-                ORDER BY segment_order
-            """),
-            {"id": submission_id}
-        )
-        seg_columns = seg_result.keys()
-        submission['segments'] = [dict(zip(seg_columns, r)) for r in seg_result.fetchall()]
-
-        # Get personas
-        persona_result = session.execute(
-            text("""
-                SELECT * FROM client_personas
-                WHERE submission_id = :id
-                ORDER BY persona_order
-            """),
-            {"id": submission_id}
-        )
-        persona_columns = persona_result.keys()
-        submission['personas'] = [dict(zip(persona_columns, r)) for r in persona_result.fetchall()]
-
-        return submission
+        # Already serialized by Postgres
+        return Response(content=submission_json, media_type="application/json")
 
     except HTTPException:
         raise
     except Exception as e:
         logger.error(f"Error retrieving submission: {e}")
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if session:
-            session.close()
 
 
 # =============================================================================
@@ -445,4 +678,13 @@ async def get_submission(submission_id: str):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop",
+        http="httptools",
+        workers=WEB_CONCURRENCY,
+        limit_concurrency=1000,
+        timeout_keep_alive=30,
+    )
@@ -3,7 +3,12 @@
 # Start FastAPI backend in background
 echo "Starting FastAPI backend..."
 cd /app/api
-uvicorn main:app --host 0.0.0.0 --port 8000 &
+# Exported so each worker splits the DB connection budget by the same count
+export WEB_CONCURRENCY="${WEB_CONCURRENCY:-2}"
+uvicorn main:app --host 0.0.0.0 --port 8000 \
+    --loop uvloop --http httptools \
+    --workers "$WEB_CONCURRENCY" \
+    --limit-concurrency 1000 --timeout-keep-alive 30 &
 
 # Wait for API to be ready
 echo "Waiting for API to be ready..."